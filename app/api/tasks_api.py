@@ -1,40 +1,161 @@
 """Task management API endpoints."""
-import uuid
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from typing import Optional
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from redis.exceptions import ConnectionError as RedisConnectionError
+from starlette.background import BackgroundTask
 
 from app.core.config import Config
-from app.models.task import TaskRequest, TaskMessage
+from app.core.logging import get_logger, setup_logging, flush_logging, request_id_ctx, task_id_ctx
+from app.models.task import TaskRequest, STATUS_CODES, MAX_MESSAGE_BYTES, decode_status
 from app.services.redis_service import RedisClient
-from app.services.rocketmq_service import RocketMQService
+from app.services.rocketmq_service import RocketMQService, RocketMQBatcher
+
+logger = get_logger(__name__)
 
 # Global resources
 redis_client = None
+pubsub_client = None
 mq_service = None
+mq_batcher = None
+mq_executor = None
+
+# Fixed routing of task messages, resolved once instead of per request
+_REQUEST_TOPIC = Config.mq.TOPIC_REQUEST
+_REQUEST_TAG = "ProfileGen"
+
+# Random bytes for task IDs, refilled in bulk to amortize the urandom syscall
+_RAND_POOL_SIZE = 4096
+_rand_pool = b""
+_rand_offset = _RAND_POOL_SIZE
+
+
+def _reset_rand_pool() -> None:
+    """Discard pooled random bytes so forked workers never share task IDs."""
+    global _rand_pool, _rand_offset
+    _rand_pool = b""
+    _rand_offset = _RAND_POOL_SIZE
+
+
+os.register_at_fork(after_in_child=_reset_rand_pool)
+
+
+def _fast_uuid_hex() -> str:
+    """Generate a random (version 4) UUID as 32 hex characters."""
+    global _rand_pool, _rand_offset
+    if _rand_offset >= _RAND_POOL_SIZE:
+        _rand_pool = os.urandom(_RAND_POOL_SIZE)
+        _rand_offset = 0
+    raw = bytearray(_rand_pool[_rand_offset:_rand_offset + 16])
+    _rand_offset += 16
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return raw.hex()
+
+
+# Statuses after which a task no longer changes
+TERMINAL_STATUSES = {"done", "failed"}
+# Terminal statuses are immutable, so polls for them are served in-process
+TERMINAL_CACHE_TTL_SECONDS = 60
+TERMINAL_CACHE_MAX_SIZE = 100_000
+_terminal_cache: dict[str, tuple[float, str]] = {}
+# Maximum lifetime of a status stream before the client has to reconnect
+STREAM_TIMEOUT_SECONDS = 60
+
+
+def _get_cached_status(task_id: str) -> Optional[str]:
+    """Return the cached terminal status of a task, if still fresh."""
+    entry = _terminal_cache.get(task_id)
+    if entry is None:
+        return None
+    expires_at, status = entry
+    if expires_at < time.monotonic():
+        del _terminal_cache[task_id]
+        return None
+    return status
+
+
+def _cache_terminal_status(task_id: str, status: str) -> None:
+    """Cache a terminal status, evicting the oldest entry when full."""
+    if len(_terminal_cache) >= TERMINAL_CACHE_MAX_SIZE:
+        # Entries share one TTL, so insertion order is expiry order
+        del _terminal_cache[next(iter(_terminal_cache))]
+    _terminal_cache[task_id] = (time.monotonic() + TERMINAL_CACHE_TTL_SECONDS, status)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle (startup and shutdown)."""
-    global redis_client, mq_service
+    global redis_client, pubsub_client, mq_service, mq_batcher, mq_executor
+
+    setup_logging()
 
     # Initialize Redis
     redis_client = RedisClient.get_instance()
+    pubsub_client = RedisClient.get_pubsub_instance()
 
     # Initialize RocketMQ
     mq_service = RocketMQService()
     mq_service.create_producer()
+    # Dedicated thread for the blocking batch submits, off the event loop;
+    # the batcher submits one batch at a time, so one thread is all it uses
+    mq_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mq-send")
+    mq_batcher = RocketMQBatcher(mq_service.producer, executor=mq_executor)
+    mq_batcher.start()
 
-    print("✅ API 服务资源已就绪")
+    logger.info("✅ API 服务资源已就绪")
     yield
 
     # Cleanup
+    await mq_batcher.stop()
     await RedisClient.close_instance()
     mq_service.shutdown_all()
-    print("🛑 资源已释放")
+    mq_executor.shutdown(wait=True)
+    logger.info("🛑 资源已释放")
+    flush_logging()
+
+
+class RequestContextMiddleware:
+    """ASGI middleware binding each HTTP request's ID to the logging context."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the caller's X-Request-ID so logs can be correlated upstream
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+
+        request_token = request_id_ctx.set(request_id or _fast_uuid_hex())
+        task_token = task_id_ctx.set("-")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            task_id_ctx.reset(task_token)
+            request_id_ctx.reset(request_token)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(RequestContextMiddleware)
 
 
-app = FastAPI(lifespan=lifespan)
+async def _send_task_message(body: bytes) -> None:
+    """Send a task message (batched with concurrent requests) and wait for the confirm."""
+    send_future = await mq_batcher.enqueue(topic=_REQUEST_TOPIC, body=body, tag=_REQUEST_TAG)
+    await send_future
 
 
 @app.post("/api/v1/tasks")
@@ -49,34 +170,46 @@ async def create_task(req: TaskRequest):
         Task ID and initial status
     """
     # Generate unique task ID
-    task_id = str(uuid.uuid4())
-    
-    print(f"收到请求: {req.content}, 生成 ID: {task_id}")
+    task_id = _fast_uuid_hex()
+    task_id_ctx.set(task_id)
+    status_key = f"task:{task_id}:status"
 
-    # Write initial status to Redis
-    await redis_client.set(f"task:{task_id}:status", "queued", ex=3600)
+    # Prepare MQ message (TaskMessage schema, encoded directly with orjson)
+    body = orjson.dumps({
+        "task_id": task_id,
+        "user_id": req.user_id,
+        "payload": req.content,
+        "action": "generate_profile"  # default action
+    })
+    if len(body) > MAX_MESSAGE_BYTES:
+        # The worker would drop it unprocessed, leaving the task queued forever
+        raise HTTPException(status_code=413, detail="任务内容过大")
 
-    # Prepare MQ message
-    task_msg = TaskMessage(
-        task_id=task_id,
-        user_id=req.user_id,
-        payload=req.content,
-        action="generate_profile"  # default action
+    # Write initial status to Redis and send to RocketMQ concurrently.
+    # NX: never overwrite a status the worker may already have written.
+    set_result, send_result = await asyncio.gather(
+        redis_client.set(status_key, STATUS_CODES["queued"], ex=3600, nx=True),
+        _send_task_message(body),
+        return_exceptions=True
     )
-    
-    # Send to RocketMQ
-    try:
-        await mq_service.send_message(
-            topic=Config.mq.TOPIC_REQUEST,
-            body=task_msg.model_dump_json().encode('utf-8'),
-            tag="ProfileGen"
-        )
-        print(f"🚀 消息已推送到 MQ: {task_id}")
-    except Exception as e:
-        print(f"❌ 发送 MQ 失败: {e}")
-        await redis_client.delete(f"task:{task_id}:status")
+    if isinstance(send_result, Exception):
+        logger.error("❌ 任务提交失败: %s", send_result)
+        if not isinstance(set_result, Exception):
+            # The task never reached MQ, so no worker has written a status
+            await redis_client.delete(status_key)
         raise HTTPException(status_code=500, detail="任务提交失败")
 
+    if isinstance(set_result, Exception):
+        # The task is queued and will run, so reporting a failure would only
+        # make the client resubmit it; retry the status write once instead
+        logger.warning("⚠️ 初始状态写入失败, 重试: %s", set_result)
+        try:
+            await redis_client.set(status_key, STATUS_CODES["queued"], ex=3600, nx=True)
+        except Exception as e:
+            logger.error("❌ 任务已入队, 但初始状态写入失败: %s", e)
+
+    logger.debug("🚀 消息已推送到 MQ, 内容: %s", req.content)
+
     return {"task_id": task_id, "status": "queued"}
 
 
@@ -91,10 +224,16 @@ async def get_task_status(task_id: str):
     Returns:
         Task status (result is sent to TopicResult MQ)
     """
-    status = await redis_client.get(f"task:{task_id}:status")
+    status = _get_cached_status(task_id)
+    if status is None:
+        status = await redis_client.get(f"task:{task_id}:status")
+
+        if not status:
+            raise HTTPException(status_code=404, detail="任务不存在")
 
-    if not status:
-        raise HTTPException(status_code=404, detail="任务不存在")
+        status = decode_status(status)
+        if status in TERMINAL_STATUSES:
+            _cache_terminal_status(task_id, status)
 
     return {
         "task_id": task_id,
@@ -103,6 +242,66 @@ async def get_task_status(task_id: str):
     }
 
 
+@app.get("/api/v1/tasks/{task_id}/stream")
+async def stream_task_status(task_id: str):
+    """
+    Stream task status changes as Server-Sent Events.
+
+    Replaces client-side polling: the worker publishes every status change
+    on ``task:{task_id}:events`` and each change is forwarded as an event.
+    The stream ends once the task reaches a terminal status or after
+    STREAM_TIMEOUT_SECONDS.
+
+    Args:
+        task_id: Task identifier
+
+    Returns:
+        text/event-stream response with one event per status change
+    """
+    # Subscribe before reading the current status so no change is missed.
+    # Subscriptions use their own pool, so open streams never starve commands.
+    pubsub = pubsub_client.pubsub()
+    try:
+        try:
+            await pubsub.subscribe(f"task:{task_id}:events")
+        except RedisConnectionError:
+            raise HTTPException(status_code=503, detail="状态订阅繁忙, 请稍后重试")
+        status = await redis_client.get(f"task:{task_id}:status")
+
+        if not status:
+            raise HTTPException(status_code=404, detail="任务不存在")
+        status = decode_status(status)
+
+        async def event_stream():
+            try:
+                yield b"data: " + orjson.dumps({"task_id": task_id, "status": status}) + b"\n\n"
+                if status in TERMINAL_STATUSES:
+                    return
+
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + STREAM_TIMEOUT_SECONDS
+                while (timeout := deadline - loop.time()) > 0:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+                    if not message:
+                        continue
+                    yield f"data: {message['data']}\n\n"
+                    if orjson.loads(message['data']).get('status') in TERMINAL_STATUSES:
+                        return
+            finally:
+                await pubsub.aclose()
+
+        # The background close also covers a client gone before the stream
+        # started, when the generator's finally never runs (aclose is idempotent)
+        return StreamingResponse(
+            event_stream(), media_type="text/event-stream", background=BackgroundTask(pubsub.aclose)
+        )
+    except BaseException:
+        # Release the subscription's connection on any failure before the
+        # response owns it (404, Redis errors, cancellation)
+        await pubsub.aclose()
+        raise
+
+
 # Backward compatibility - keep old routes
 @app.post("/tasks")
 async def create_task_legacy(req: TaskRequest):
@@ -6,50 +6,53 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import asyncio
+import logging
+import signal
+
+try:
+    import uvloop
+except ImportError:  # Not installed on Windows
+    uvloop = None
+
 from app.services.proxy_agent import proxy_agent
 from app.core.logging import setup_logging, LOG_FORMAT
 
-print(f"DEBUG: LOG_FORMAT is: {LOG_FORMAT}")
+logger = logging.getLogger("worker_api")
 
 async def main():
     """Start the ProxyAgent worker service."""
     setup_logging()
-    import signal
+    logger.debug("LOG_FORMAT is: %s", LOG_FORMAT)
 
     # Create a stop event
     stop_event = asyncio.Event()
 
     # Register signal handlers
     loop = asyncio.get_running_loop()
-    def handle_signal(sig):
-        print(f"DEBUG: Received signal {sig}")
-        stop_event.set()
-
     for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, lambda s=sig: handle_signal(s))
-
-    import logging
-    logger = logging.getLogger("worker_api")
+        loop.add_signal_handler(sig, stop_event.set)
 
     try:
         await proxy_agent.startup()
 
         # Wait for stop signal
         logger.warning("DEBUG: Waiting for stop signal...")
-        while not stop_event.is_set():
-            await asyncio.sleep(1)
+        await stop_event.wait()
         logger.warning("DEBUG: Stop signal received!")
     except (KeyboardInterrupt, asyncio.CancelledError):
         logger.warning("DEBUG: KeyboardInterrupt or CancelledError")
         pass
     except BaseException as e:
-        import traceback
-        logger.error(f"CRITICAL ERROR (BaseException) in main: {e}")
-        traceback.print_exc()
+        logger.exception("CRITICAL ERROR (BaseException) in main: %s", e)
     finally:
         logger.warning("DEBUG: Entering finally block")
         await proxy_agent.shutdown()
 
 
+def run():
+    """Run the worker service, on uvloop when it is available."""
+    asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop else None)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run()
\ No newline at end of file
@@ -10,6 +10,11 @@ class RedisConfig:
     """Redis configuration."""
     HOST = os.getenv("REDIS_HOST", "localhost")
     PORT = int(os.getenv("REDIS_PORT", "6379"))
+    MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+    # Separate pool for pub/sub: each open status stream holds one connection
+    PUBSUB_MAX_CONNECTIONS = int(os.getenv("REDIS_PUBSUB_MAX_CONNECTIONS", "128"))
+    POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+    HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
 
 
 class RocketMQConfig:
@@ -20,9 +25,29 @@ class RocketMQConfig:
     TOPIC_REQUEST = os.getenv("MQ_TOPIC_REQUEST", "TopicTest")
     TOPIC_RESULT = os.getenv("MQ_TOPIC_RESULT", "TopicResult")
     GROUP_AGENT = os.getenv("MQ_GROUP_AGENT", "GID_AGENT_PYTHON")
+    # Producer-side batching for the task submission path
+    BATCH_MAX_MESSAGES = int(os.getenv("MQ_BATCH_MAX_MESSAGES", "64"))
+    BATCH_MAX_SECONDS = float(os.getenv("MQ_BATCH_MAX_SECONDS", "0.005"))
+    # Worker-side receive: most messages per receive (0: the worker's
+    # concurrency) and how long received messages stay invisible
+    RECV_BATCH = int(os.getenv("MQ_RECV_BATCH") or 0)
+    INVISIBLE_DURATION = int(os.getenv("MQ_INVISIBLE_DURATION", "30"))
+
+
+class APIConfig:
+    """API server configuration."""
+    WORKERS = int(os.getenv("API_WORKERS") or os.cpu_count() or 1)
+
+
+class AgentConfig:
+    """Agent configuration."""
+    # Simulated processing time of MockAgent (0 measures the bare pipeline)
+    MOCK_DELAY_MS = int(os.getenv("MOCK_AGENT_DELAY_MS", "0"))
 
 
 class Config:
     """Application configuration."""
     redis = RedisConfig()
     mq = RocketMQConfig()
+    api = APIConfig()
+    agent = AgentConfig()
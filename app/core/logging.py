@@ -1,69 +1,107 @@
 """Logging configuration with request and task ID tracking."""
+import atexit
 import logging
+import queue
 import sys
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 # Configure logging format
-LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] [%(task_id)s] %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Request/task context of the running coroutine, attached to every log record
+request_id_ctx: ContextVar[str] = ContextVar("request_id", default="-")
+task_id_ctx: ContextVar[str] = ContextVar("task_id", default="-")
 
-class ContextFilter(logging.Filter):
-    """Filter to inject default request_id and task_id if missing."""
-    def filter(self, record):
-        if not hasattr(record, 'request_id'):
-            record.request_id = '-'
-        if not hasattr(record, 'task_id'):
-            record.task_id = '-'
-        return True
+# Background listener that performs the actual log I/O
+_listener: Optional[QueueListener] = None
+
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _context_record_factory(*args, **kwargs) -> logging.LogRecord:
+    """Create log records carrying the current request_id and task_id."""
+    record = _base_record_factory(*args, **kwargs)
+    record.request_id = request_id_ctx.get()
+    record.task_id = task_id_ctx.get()
+    return record
+
+
+logging.setLogRecordFactory(_context_record_factory)
 
 
 def setup_logging(level: str = "INFO") -> None:
     """
     Setup application logging configuration.
-    
+
+    Records are put on an in-memory queue and written to stdout by a
+    background QueueListener thread, so logging never blocks the event loop
+    on stream I/O.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _listener
+
     # Create handler
     handler = logging.StreamHandler(sys.stdout)
-    
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+
+    # Restart the listener if logging is reconfigured
+    if _listener:
+        _listener.stop()
+    else:
+        atexit.register(_stop_listener)
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+    # Only the message is rendered on the caller side; the listener applies LOG_FORMAT
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
     # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.addFilter(ContextFilter())
-    
     logging.basicConfig(
         level=getattr(logging, level.upper()),
-        format=LOG_FORMAT,
-        datefmt=DATE_FORMAT,
-        handlers=[handler],
+        handlers=[queue_handler],
         force=True  # Force reconfiguration
     )
 
 
-class LoggerAdapter(logging.LoggerAdapter):
-    """Logger adapter with request_id and task_id context."""
-    
-    def process(self, msg, kwargs):
-        """Add request_id and task_id to log record."""
-        request_id = self.extra.get('request_id', '-')
-        task_id = self.extra.get('task_id', '-')
-        return f'[{request_id}] [{task_id}] {msg}', kwargs
+def flush_logging() -> None:
+    """
+    Write out every queued log record.
+
+    For shutdown paths that skip atexit, e.g. uvicorn worker processes,
+    which terminate by re-raising the shutdown signal.
+    """
+    if _listener:
+        _listener.stop()
+        _listener.start()
+
 
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener at interpreter exit."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
 
-def get_logger(name: str, request_id: Optional[str] = None, task_id: Optional[str] = None) -> logging.Logger:
+
+def get_logger(name: str) -> logging.Logger:
     """
-    Get a logger with optional request_id and task_id context.
-    
+    Get a logger by name.
+
+    Request and task context is not bound to the logger; set request_id_ctx /
+    task_id_ctx at the entry point of a request or task and every record
+    logged from that context carries them.
+
     Args:
         name: Logger name
-        request_id: Optional request ID for tracking
-        task_id: Optional task ID for tracking
-        
+
     Returns:
-        Logger instance with context
+        Logger instance
     """
-    logger = logging.getLogger(name)
-    if request_id or task_id:
-        return LoggerAdapter(logger, {'request_id': request_id or '-', 'task_id': task_id or '-'})
-    return logger
+    return logging.getLogger(name)
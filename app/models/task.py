@@ -2,6 +2,24 @@
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
+# Task statuses are stored in Redis as one-character codes to keep values small
+STATUS_CODES: Dict[str, str] = {
+    "queued": "Q",
+    "running": "R",
+    "done": "D",
+    "failed": "F",
+}
+STATUS_NAMES: Dict[str, str] = {code: status for status, code in STATUS_CODES.items()}
+
+# Largest encoded task message: the API rejects bigger tasks and the worker
+# acks and drops bigger bodies without running them
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+def decode_status(value: str) -> str:
+    """Map a stored status code to its name (full names written before the codes pass through)."""
+    return STATUS_NAMES.get(value, value)
+
 
 class TaskRequest(BaseModel):
     """HTTP request model for creating a task."""
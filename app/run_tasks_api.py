@@ -6,7 +6,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import uvicorn
-from app.api.tasks_api import app
+from app.core.config import Config
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Import-string form so uvicorn can start multiple worker processes.
+    # loop/http default to "auto", which selects uvloop and httptools when installed.
+    uvicorn.run("app.api.tasks_api:app", host="0.0.0.0", port=8000, workers=Config.api.WORKERS)
@@ -10,10 +10,16 @@ _AGENT_REGISTRY: Dict[str, Type[BaseAgent]] = {
     # Add more agents here as they are implemented
 }
 
+# Shared agent instances, created on first use (agents must be stateless)
+_AGENT_INSTANCES: Dict[str, BaseAgent] = {}
+
 
 def create_agent(agent_type: str) -> BaseAgent:
     """
-    Create an agent instance based on agent_type.
+    Get the agent instance for agent_type.
+
+    Agents keep no per-task state, so one instance per type is created on
+    first use and shared by all tasks.
     
     Args:
         agent_type: Type of agent to create
@@ -24,6 +30,10 @@ def create_agent(agent_type: str) -> BaseAgent:
     Raises:
         ValueError: If agent_type is not registered
     """
+    agent = _AGENT_INSTANCES.get(agent_type)
+    if agent is not None:
+        return agent
+
     agent_class = _AGENT_REGISTRY.get(agent_type)
     
     if not agent_class:
@@ -32,7 +42,8 @@ def create_agent(agent_type: str) -> BaseAgent:
             f"Available types: {list(_AGENT_REGISTRY.keys())}"
         )
     
-    return agent_class()
+    agent = _AGENT_INSTANCES[agent_type] = agent_class()
+    return agent
 
 
 def register_agent(agent_type: str, agent_class: Type[BaseAgent]) -> None:
@@ -44,6 +55,7 @@ def register_agent(agent_type: str, agent_class: Type[BaseAgent]) -> None:
         agent_class: Agent class to register
     """
     _AGENT_REGISTRY[agent_type] = agent_class
+    _AGENT_INSTANCES.pop(agent_type, None)
 
 
 def get_available_agents() -> list[str]:
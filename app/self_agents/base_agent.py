@@ -13,6 +13,9 @@ class BaseAgent(ABC):
     - Input preparation
     - Response parsing
     - Error handling
+
+    A single instance per agent type is shared by all tasks (see
+    create_agent), so implementations must not keep per-task state on self.
     """
     
     def __init__(self, agent_type: str):
@@ -1,6 +1,7 @@
 """Mock Agent implementation for testing."""
 import asyncio
 from typing import Any, Dict
+from app.core.config import Config
 from app.self_agents.base_agent import BaseAgent
 from app.models.task import TaskResult
 
@@ -14,10 +15,10 @@ class MockAgent(BaseAgent):
     async def prepare_input(self, payload: Dict[str, Any]) -> str:
         """Extract content from payload."""
         # Handle multiple possible content field locations
+        nested = payload.get("payload")
         content = (
             payload.get("content") or              # Direct content field
-            payload.get("payload", {}).get("content") or  # Nested content in payload
-            payload.get("payload") or              # Raw payload string
+            (nested.get("content") if isinstance(nested, dict) else nested) or  # Nested content or raw payload string
             str(payload)                           # Fallback to string representation
         )
         return content
@@ -33,8 +34,9 @@ class MockAgent(BaseAgent):
         Returns:
             Mock processing result
         """
-        # Simulate processing delay
-        await asyncio.sleep(3)
+        # Simulate processing delay (MOCK_AGENT_DELAY_MS)
+        if Config.agent.MOCK_DELAY_MS:
+            await asyncio.sleep(Config.agent.MOCK_DELAY_MS / 1000)
         
         # Generate mock result
         result = TaskResult(
@@ -1,22 +1,31 @@
 """ProxyAgent service for consuming and processing tasks with concurrency control."""
 import asyncio
-import json
 import logging
 import signal
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import orjson
 from rocketmq import SimpleConsumer, Producer, Message, FilterExpression
 
 from app.core.config import Config
 from app.services.redis_service import RedisClient
-from app.services.rocketmq_service import RocketMQService
+from app.services.rocketmq_service import RocketMQService, MQSubmitThread
 from app.self_agents import create_agent
-from app.core.logging import get_logger
-from app.models.task import TaskResult
+from app.core.logging import get_logger, task_id_ctx
+from app.models.task import TaskResult, STATUS_CODES, MAX_MESSAGE_BYTES
 
 logger = get_logger(__name__)
 
+# Tag set on every task result message
+_RESULT_TAG = "AgentResult"
+
+# Bodies above this size are parsed off the event loop; above
+# MAX_MESSAGE_BYTES they are rejected (acked and dropped)
+INLINE_PARSE_MAX_BYTES = 64 * 1024
+
 
 class ProxyAgent:
     """
@@ -39,9 +48,19 @@ class ProxyAgent:
         self.producer = None
         self.redis_client = None
         self._started = False
-        self._active_tasks = 0  # Track active task count
         self._consumer_task: Optional[asyncio.Task] = None
         self._stop_event: Optional[asyncio.Event] = None
+        self._mq_executor: Optional[ThreadPoolExecutor] = None
+        self._mq_submit: Optional[MQSubmitThread] = None
+        self._pending: deque = deque()  # Received messages waiting for a slot
+        self._receiving: Optional[asyncio.Future] = None  # Prefetching receive, if any
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._result_topic: Optional[str] = None
+        # Most messages asked for in one receive (unset: the concurrency). A
+        # receive never asks for more than the free slots, so how long a
+        # message waits for its ack does not depend on this or on task duration
+        self._recv_batch = Config.mq.RECV_BATCH or max_concurrent_tasks
+        self._invisible_duration = Config.mq.INVISIBLE_DURATION
 
     async def startup(self):
         """Initialize and start the ProxyAgent service."""
@@ -51,6 +70,12 @@ class ProxyAgent:
 
         logger.info(f"🚀 Starting ProxyAgent with max_concurrent_tasks={self.max_concurrent_tasks}")
 
+        # Event loop the agent runs on, used for executor hand-offs
+        self._loop = asyncio.get_running_loop()
+
+        # Topic every task result is sent to
+        self._result_topic = Config.mq.TOPIC_RESULT
+
         # Initialize Redis client
         self.redis_client = RedisClient.get_instance()
 
@@ -60,12 +85,21 @@ class ProxyAgent:
         # Create stop event for graceful shutdown
         self._stop_event = asyncio.Event()
 
+        # Dedicated thread for the long-polling receive; sends and acks go
+        # through the submit thread instead
+        self._mq_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="mq-receive"
+        )
+
         # Initialize RocketMQ consumer and producer
         self.consumer = self.mq_service.create_consumer(
             consumer_group=Config.mq.GROUP_AGENT,
             topic=Config.mq.TOPIC_REQUEST
         )
         self.producer = self.mq_service.create_producer()
+        self._mq_submit = MQSubmitThread(self.producer, self.consumer)
+        self._mq_submit.start()
 
         logger.info("✅ ProxyAgent initialized successfully")
 
@@ -86,27 +120,15 @@ class ProxyAgent:
         if self._stop_event:
             self._stop_event.set()
 
-        # Wait for consumer task to finish
+        # Wait for the consumer loop, including the tasks it dispatched, to finish
         if self._consumer_task:
+            logger.info("Waiting for active tasks to complete...")
             try:
-                await asyncio.wait_for(self._consumer_task, timeout=10)
+                # Allow up to 30s of active tasks, plus some margin
+                await asyncio.wait_for(self._consumer_task, timeout=40)
             except asyncio.TimeoutError:
-                logger.warning("Consumer task did not finish in time, cancelling...")
-                self._consumer_task.cancel()
-                try:
-                    await self._consumer_task
-                except asyncio.CancelledError:
-                    pass
-
-        # Wait for active tasks to complete (with timeout)
-        if self._active_tasks > 0:
-            logger.info(f"Waiting for {self._active_tasks} active tasks to complete...")
-            wait_time = 0
-            while self._active_tasks > 0 and wait_time < 30:
-                await asyncio.sleep(1)
-                wait_time += 1
-            if self._active_tasks > 0:
-                logger.warning(f"{self._active_tasks} tasks still active after timeout")
+                # wait_for has cancelled the loop and, with it, the remaining tasks
+                logger.warning("Consumer did not finish in time, cancelled the remaining active tasks")
 
         # Cleanup resources
         await self._cleanup()
@@ -117,121 +139,221 @@ class ProxyAgent:
     async def _consumer_loop(self):
         """
         Background loop that consumes messages from RocketMQ.
-        Only pulls messages when there are available slots (semaphore).
+        Only dispatches messages when there are available slots (semaphore).
+        A receive asks for no more messages than there are free slots, so a
+        received message never waits for a running task to finish before it
+        is acked; slots left free after dispatch are filled by a prefetch.
+        Each accepted message is processed concurrently in its own task.
         """
         logger.info("Starting consumer loop...")
 
-        while not self._stop_event.is_set():
-            try:
-                # Check if we have available capacity
-                if self._active_tasks >= self.max_concurrent_tasks:
-                    # No available slots, wait a bit before checking again
-                    await asyncio.sleep(0.1)
-                    continue
-
-                # Calculate how many messages we can handle
-                available_slots = self.max_concurrent_tasks - self._active_tasks
-
-                # Receive messages (blocking call, run in executor)
-                loop = asyncio.get_running_loop()
-                def receive_messages():
-                    return self.consumer.receive(
-                        max_message_num=min(available_slots, 16),  # Batch size, max 16
-                        invisible_duration=30
-                    )
-
-                messages = await loop.run_in_executor(None, receive_messages)
-
-                if not messages:
-                    # No messages, wait a bit before polling again
-                    await asyncio.sleep(0.1)
-                    continue
-
-                logger.info(f"📥 Received {len(messages)} messages from RocketMQ")
-
-                # Process each message
-                for msg in messages:
-                    # Double-check we still have capacity
-                    if self._active_tasks >= self.max_concurrent_tasks:
-                        logger.warning("Max capacity reached, message will be redelivered")
-                        break  # Message will be redelivered after invisible_duration
-
-                    try:
-                        # Parse message body
-                        body = msg.body.decode('utf-8')
-                        data = json.loads(body)
-                        task_id = data.get('task_id')
-                        user_id = data.get('user_id')
-
-                        # Determine agent type from the message
-                        # Default to mock_agent, but can be set via payload or a specific field
-                        agent_type = data.get('agent_type', 'mock_agent')
-
-                        # If payload has specific fields that indicate agent type
-                        content = data.get('payload', data.get('content', ''))
-
-                        logger.info(f"Processing task {task_id} from RocketMQ")
-
-                        # Check capacity again before processing
-                        if self._active_tasks >= self.max_concurrent_tasks:
-                            logger.warning(f"Could not process task {task_id}, max capacity reached, will retry")
-                            break  # Message will be redelivered
-
-                        # Acquire semaphore (should succeed since we checked capacity)
-                        await self.semaphore.acquire()
-
-                        self._active_tasks += 1
-                        logger.info(f"📊 Task {task_id} accepted (active={self._active_tasks}/{self.max_concurrent_tasks})")
-
-                        # Acknowledge message immediately since we've taken ownership
-                        await loop.run_in_executor(None, self.consumer.ack, msg)
-
-                        # Parse message and process task in background
-                        task_data = {
-                            'task_id': task_id,
-                            'user_id': user_id,
-                            'agent_type': agent_type,
-                            'payload': {
+        # Completes on shutdown; raced against the broker long-poll and the
+        # error backoff so neither delays stopping
+        stop_wait = asyncio.create_task(self._stop_event.wait())
+
+        # Bind the attributes used on every pass to locals once
+        stop_is_set = self._stop_event.is_set
+        acquire = self.semaphore.acquire
+        release = self.semaphore.release
+        locked = self.semaphore.locked
+        pending = self._pending
+        recv_batch = self._recv_batch
+        loads = orjson.loads
+        process = self._process_with_semaphore
+
+        # Dispatched tasks live in this group: they are strongly referenced, and
+        # the loop only returns once every task it started has finished
+        async with asyncio.TaskGroup() as tg:
+            while not stop_is_set():
+                # Wait for a free slot, then claim whatever else is free right now
+                # (up to the receive batch size)
+                await acquire()
+                slots = 1
+                while slots < recv_batch and not locked():
+                    await acquire()
+                    slots += 1
+
+                try:
+                    if stop_is_set():
+                        break
+
+                    # Only go to the broker once the buffered messages are used up,
+                    # picking up the prefetched batch if one is already in flight,
+                    # else asking for just as many messages as there are free slots
+                    if not pending:
+                        receiving, self._receiving = self._receiving or self._start_receive(slots), None
+                        await asyncio.wait({receiving, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                        if not receiving.done():
+                            # Stopping mid long-poll; the receive is dropped below
+                            self._receiving = receiving
+                            break
+                        received = receiving.result()
+
+                        if not received:
+                            # receive() already long-polled, so poll again right away
+                            continue
+
+                        logger.info("📥 Received %d messages from RocketMQ", len(received))
+                        pending.extend(received)
+
+                    # Take as many buffered messages as there are claimed slots.
+                    # A message that outlives its invisible duration in the buffer
+                    # fails to ack below and is left to its redelivery.
+                    messages = [pending.popleft() for _ in range(min(slots, len(pending)))]
+
+                    # Messages to ack in one batch, and the tasks to
+                    # dispatch once their message has been acked
+                    to_ack = []
+                    accepted = []
+
+                    # Process each message
+                    for msg in messages:
+                        try:
+                            body_size = len(msg.body)
+                            if body_size > MAX_MESSAGE_BYTES:
+                                logger.error(f"Rejecting oversized message body ({body_size} bytes > {MAX_MESSAGE_BYTES})")
+                                # Ack it so it is not redelivered
+                                to_ack.append(msg)
+                                continue
+
+                            # Parse message body; large bodies in a worker thread
+                            # so the parse does not stall the event loop
+                            if body_size > INLINE_PARSE_MAX_BYTES:
+                                data = await self._loop.run_in_executor(None, loads, msg.body)
+                            else:
+                                data = loads(msg.body)
+                            # Required TaskMessage fields
+                            task_id = data['task_id']
+                            user_id = data['user_id']
+
+                            # Determine agent type from the message
+                            # Default to mock_agent, but can be set via payload or a specific field
+                            agent_type = data.get('agent_type', 'mock_agent')
+
+                            logger.info("Processing task %s from RocketMQ", task_id)
+
+                            # Parse message and process task in background; the agent
+                            # gets the decoded message itself as its payload
+                            task_data = {
                                 'task_id': task_id,
                                 'user_id': user_id,
-                                'content': content,
-                                **data  # include all original data
+                                'agent_type': agent_type,
+                                'payload': data
                             }
-                        }
 
-                        # Process in background
-                        asyncio.create_task(self._process_with_semaphore(task_data))
+                            # Acknowledge with the rest of the batch since we've taken ownership
+                            to_ack.append(msg)
+                            accepted.append((msg, task_data))
+
+                        except orjson.JSONDecodeError as e:
+                            logger.error(f"Failed to decode message body: {e}")
+                            # Ack bad message to avoid infinite redelivery
+                            to_ack.append(msg)
+                        except (KeyError, TypeError) as e:
+                            logger.error(f"Malformed task message, missing or invalid field: {e!r}")
+                            # Ack bad message to avoid infinite redelivery
+                            to_ack.append(msg)
+                        except Exception as e:
+                            logger.error(f"Error processing message: {e}")
+                            # Don't ack, let message be redelivered
+
+                    ack_errors = await self._ack_messages(to_ack) if to_ack else {}
+
+                    for msg, task_data in accepted:
+                        if msg in ack_errors:
+                            # Not acked, so the message will be redelivered
+                            logger.error(f"Failed to ack task {task_data['task_id']}: {ack_errors[msg]}")
+                            continue
+
+                        # Process in background; the task's slot is freed when it finishes
+                        slots -= 1
+                        task = tg.create_task(process(task_data))
+                        task.add_done_callback(lambda _: release())
+
+                    # Prefetch for the slots this batch left free, and only for
+                    # those: with every slot busy, received messages would sit
+                    # unacked for a whole task and could outlive their invisible
+                    # duration. The slots are claimed again on the next pass.
+                    if slots and not pending:
+                        self._receiving = self._start_receive(slots)
+
+                except Exception as e:
+                    logger.error(f"Error in consumer loop: {e}")
+                    await asyncio.wait({stop_wait}, timeout=1)  # Wait before retrying
+                finally:
+                    # Give back the slots no task was dispatched for
+                    for _ in range(slots):
+                        release()
+
+        stop_wait.cancel()
+
+        if self._receiving is not None:
+            # Whatever the prefetch returns is never acked and gets redelivered
+            if not self._receiving.cancel():
+                self._receiving.exception()  # Already done; mark any error as retrieved
+            self._receiving = None
+
+        if self._pending:
+            # Never acked, so the broker redelivers them after their invisible duration
+            logger.info(f"Leaving {len(self._pending)} buffered messages for redelivery")
+            self._pending.clear()
 
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to decode message body: {e}")
-                        # Ack bad message to avoid infinite redelivery
-                        await loop.run_in_executor(None, self.consumer.ack, msg)
-                    except Exception as e:
-                        logger.error(f"Error processing message: {e}")
-                        # Don't ack, let message be redelivered
+        logger.info("Consumer loop stopped")
 
-            except Exception as e:
-                logger.error(f"Error in consumer loop: {e}")
-                await asyncio.sleep(1)  # Wait before retrying
+    def _start_receive(self, max_message_num: int) -> asyncio.Future:
+        """
+        Start receiving the next batch on the receive thread.
 
-        logger.info("Consumer loop stopped")
+        Args:
+            max_message_num: Maximum number of messages to receive
+
+        Returns:
+            asyncio.Future: Resolves to the received messages
+        """
+        # Receive messages (blocking call, run in executor)
+        def receive_messages():
+            return self.consumer.receive(
+                max_message_num=max_message_num,
+                invisible_duration=self._invisible_duration
+            )
+
+        return self._loop.run_in_executor(self._mq_executor, receive_messages)
+
+    async def _ack_messages(self, messages: list) -> dict:
+        """
+        Acknowledge a batch of messages through the submit thread.
+
+        Args:
+            messages: Messages to acknowledge
+
+        Returns:
+            dict: Exception raised for each message that could not be acked
+        """
+        outcomes = await asyncio.gather(
+            *(self._mq_submit.ack(msg) for msg in messages),
+            return_exceptions=True
+        )
+        return {msg: e for msg, e in zip(messages, outcomes) if isinstance(e, Exception)}
 
     async def _process_with_semaphore(self, task_data: dict):
         """
-        Process task and release semaphore when done.
+        Process a task that holds a semaphore slot.
+
+        The slot is released by the done-callback the consumer loop attaches
+        to this task.
 
         Args:
             task_data: The task data to process
         """
         task_id = task_data.get('task_id')
+        # Runs in its own asyncio task, so the context stays local to this task
+        task_id_ctx.set(task_id or '-')
         try:
             await self.process_task(task_data)
         except Exception as e:
             logger.error(f"❌ [Task {task_id}] Uncaught error in task processing: {e}")
         finally:
-            self.semaphore.release()
-            self._active_tasks -= 1
-            logger.info(f"📊 Task {task_id} completed, released slot (active={self._active_tasks}/{self.max_concurrent_tasks})")
+            logger.info("📊 Task %s completed, released slot", task_id)
 
     async def process_task(self, task_data: dict) -> dict:
         """
@@ -245,52 +367,52 @@ class ProxyAgent:
         """
         task_id = task_data.get('task_id')
         user_id = task_data.get('user_id')
-        start_time = time.time()
-        logger.info(f"[PERF] [Task {task_id}] process_task started")
+        perf = logger.isEnabledFor(logging.DEBUG)
+        start_time = time.perf_counter() if perf else 0
+        if perf:
+            logger.debug(f"[PERF] [Task {task_id}] process_task started")
 
         try:
-            # Update status to running
-            await self.redis_client.set(f"task:{task_id}:status", "running", ex=3600)
+            # Update status to running without holding up the agent; the write
+            # is awaited before any later status so transitions stay ordered
+            running_write = asyncio.create_task(self._set_status(task_id, "running"))
 
             # Execute the agent task
-            execute_start = time.time()
-            result = await self._execute_task(task_data)
-            execute_elapsed = time.time() - execute_start
-            logger.info(f"[PERF] [Task {task_id}] Agent execution: {execute_elapsed:.3f}s")
+            execute_start = time.perf_counter() if perf else 0
+            try:
+                result = await self._execute_task(task_data)
+            finally:
+                # Wait out the write whatever the agent did, but never let a
+                # Redis error replace the agent outcome
+                running_error, = await asyncio.gather(running_write, return_exceptions=True)
+                if running_error is not None:
+                    logger.error(f"Failed to update task status: {running_error}")
+            if perf:
+                execute_elapsed = time.perf_counter() - execute_start
+                logger.debug(f"[PERF] [Task {task_id}] Agent execution: {execute_elapsed:.3f}s")
 
             # Check if the agent execution resulted in an error
             if not result.get('success', True):
                 # Agent reported an error, update status and send error result
-                await self.redis_client.set(f"task:{task_id}:status", "failed", ex=3600)
-
-                # Send error result to RocketMQ result topic
-                await self._send_result_to_mq(task_data, result)
+                # to RocketMQ result topic concurrently
+                await self._finish_task(task_data, "failed", result)
                 # Return the error result without raising (consistent with exception case)
                 return result
 
-            # Update status to done only if successful
-            await self.redis_client.set(f"task:{task_id}:status", "done", ex=3600)
-
-            # Send result to RocketMQ result topic
-            mq_start = time.time()
-            await self._send_result_to_mq(task_data, result)
-            mq_elapsed = time.time() - mq_start
-            logger.info(f"[PERF] [Task {task_id}] RocketMQ send: {mq_elapsed:.3f}s")
+            # Update status to done and send result to RocketMQ result topic concurrently
+            mq_start = time.perf_counter() if perf else 0
+            await self._finish_task(task_data, "done", result)
+            if perf:
+                mq_elapsed = time.perf_counter() - mq_start
+                logger.debug(f"[PERF] [Task {task_id}] Status update + RocketMQ send: {mq_elapsed:.3f}s")
 
-            total_elapsed = time.time() - start_time
-            logger.info(f"[PERF] [Task {task_id}] TOTAL process_task: {total_elapsed:.3f}s")
+                total_elapsed = time.perf_counter() - start_time
+                logger.debug(f"[PERF] [Task {task_id}] TOTAL process_task: {total_elapsed:.3f}s")
             return result
 
         except Exception as e:
             logger.error(f"❌ [Task {task_id}] ProxyAgent failed to process task: {e}")
 
-            # Update task status to failed
-            try:
-                await self.redis_client.set(f"task:{task_id}:status", "failed", ex=3600)
-            except Exception as redis_error:
-                logger.error(f"Failed to update task status: {redis_error}")
-
-            # Send error result to RocketMQ
             error_result = {
                 "success": False,
                 "error": {
@@ -302,9 +424,46 @@ class ProxyAgent:
                 "agent_type": task_data.get('agent_type', 'unknown')
             }
 
-            await self._send_result_to_mq(task_data, error_result)
+            # Update task status to failed and send error result to RocketMQ concurrently
+            await self._finish_task(task_data, "failed", error_result)
             raise
 
+    async def _finish_task(self, task_data: dict, status: str, result: dict):
+        """
+        Write the terminal status and send the result concurrently.
+
+        Never raises: the result goes out regardless of the status write, so a
+        failed write is only logged; letting it reach process_task's error
+        handling would send a second, contradictory result for the task.
+        _send_result_to_mq logs its own failures.
+
+        Args:
+            task_data: The original task data
+            status: Terminal task status ("done" or "failed")
+            result: The result to send
+        """
+        task_id = task_data.get('task_id')
+        redis_error, _ = await asyncio.gather(
+            self._set_status(task_id, status),
+            self._send_result_to_mq(task_data, result),
+            return_exceptions=True
+        )
+        if redis_error is not None:
+            logger.error(f"Failed to update task status: {redis_error}")
+
+    async def _set_status(self, task_id: str, status: str):
+        """
+        Update task status and notify stream subscribers in one round-trip.
+
+        Args:
+            task_id: Task identifier
+            status: New task status
+        """
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(f"task:{task_id}:status", STATUS_CODES[status], ex=3600)
+            pipe.publish(f"task:{task_id}:events", orjson.dumps({"task_id": task_id, "status": status}))
+            await pipe.execute()
+
     async def _execute_task(self, task_data: dict) -> dict:
         """
         Execute the actual task logic using agent factory.
@@ -320,7 +479,7 @@ class ProxyAgent:
         payload = task_data.get('payload', {})
 
         try:
-            logger.info(f"Executing task {task_id} with agent type: {agent_type}")
+            logger.info("Executing task %s with agent type: %s", task_id, agent_type)
 
             # Create appropriate agent
             agent = create_agent(agent_type)
@@ -328,7 +487,8 @@ class ProxyAgent:
             # Execute agent
             result = await agent.execute(task_id, payload)
 
-            logger.info(f"✅ [Task {task_id}] Result JSON: {json.dumps(result, ensure_ascii=False, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ [Task {task_id}] Result JSON: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}")
 
             return result
 
@@ -336,6 +496,24 @@ class ProxyAgent:
             logger.error(f"❌ [Task {task_id}] Error executing task with agent: {e}")
             raise
 
+    def _new_result_msg(self, task_id: str, body: bytes) -> Message:
+        """
+        Build a result message; only the body and keys vary per task.
+
+        Args:
+            task_id: Task identifier, used as the message key
+            body: Encoded result body
+
+        Returns:
+            Message: Message ready to send to the result topic
+        """
+        msg = Message()
+        msg.topic = self._result_topic
+        msg.tag = _RESULT_TAG
+        msg.keys = task_id
+        msg.body = body
+        return msg
+
     async def _send_result_to_mq(self, task_data: dict, result: dict):
         """
         Send task result to RocketMQ result topic.
@@ -347,41 +525,40 @@ class ProxyAgent:
         task_id = task_data.get('task_id')
         user_id = task_data.get('user_id')
 
-        import time
-        start_time = time.time()
-        logger.info(f"[PERF] [Task {task_id}] RocketMQ send started")
+        perf = logger.isEnabledFor(logging.DEBUG)
+        start_time = time.perf_counter() if perf else 0
+        if perf:
+            logger.debug(f"[PERF] [Task {task_id}] RocketMQ send started")
 
         try:
             if not self.producer:
                 logger.error("RocketMQ producer not initialized, cannot send result")
                 return
 
-            prepare_start = time.time()
-            result_msg = Message()
-            result_msg.topic = Config.mq.TOPIC_RESULT
-            result_msg.body = json.dumps({
+            prepare_start = time.perf_counter() if perf else 0
+            result_msg = self._new_result_msg(task_id, orjson.dumps({
                 "task_id": task_id,
                 "user_id": user_id,
                 "result": result.get('data')
-            }).encode('utf-8')
-            result_msg.tag = "AgentResult"
-            result_msg.keys = task_id
-            prepare_elapsed = time.time() - prepare_start
-            logger.info(f"[PERF] [Task {task_id}] RocketMQ message prepare: {prepare_elapsed:.3f}s")
+            }))
+            if perf:
+                prepare_elapsed = time.perf_counter() - prepare_start
+                logger.debug(f"[PERF] [Task {task_id}] RocketMQ message prepare: {prepare_elapsed:.3f}s")
 
-            logger.info(f"📤 [Task {task_id}] Sending to RocketMQ - Topic: {result_msg.topic}, Tag: {result_msg.tag}")
+            logger.info("📤 [Task %s] Sending to RocketMQ - Topic: %s, Tag: %s", task_id, self._result_topic, _RESULT_TAG)
 
-            # Use executor for the producer.send operation (blocking)
-            loop = asyncio.get_running_loop()
-            send_start = time.time()
-            send_result = await loop.run_in_executor(None, self.producer.send, result_msg)
-            send_elapsed = time.time() - send_start
-            logger.info(f"[PERF] [Task {task_id}] RocketMQ send: {send_elapsed:.3f}s")
+            # Submitted by the submit thread; awaits the broker confirm
+            send_start = time.perf_counter() if perf else 0
+            send_result = await self._mq_submit.send(result_msg)
+            if perf:
+                send_elapsed = time.perf_counter() - send_start
+                logger.debug(f"[PERF] [Task {task_id}] RocketMQ send: {send_elapsed:.3f}s")
 
-            logger.info(f"✅ [Task {task_id}] RocketMQ Send Success - MessageId={send_result.msg_id if hasattr(send_result, 'msg_id') else 'unknown'}, TaskId={task_id}")
+            logger.info("✅ [Task %s] RocketMQ Send Success - MessageId=%s, TaskId=%s", task_id, getattr(send_result, 'msg_id', 'unknown'), task_id)
 
-            total_mq_time = time.time() - start_time
-            logger.info(f"[PERF] [Task {task_id}] RocketMQ TOTAL: {total_mq_time:.3f}s - sent successfully")
+            if perf:
+                total_mq_time = time.perf_counter() - start_time
+                logger.debug(f"[PERF] [Task {task_id}] RocketMQ TOTAL: {total_mq_time:.3f}s - sent successfully")
 
         except Exception as e:
             logger.error(f"❌ [Task {task_id}] Failed to send task result to RocketMQ: {e}")
@@ -390,9 +567,18 @@ class ProxyAgent:
         """Clean up resources."""
         logger.info("🧹 Cleaning up resources...")
 
+        if self._mq_submit:
+            self._mq_submit.stop()
+            self._mq_submit = None
+
         self.mq_service.shutdown_all()
         logger.info("✅ MQ connections closed")
 
+        if self._mq_executor:
+            # Don't block on a receive still long-polling; its result is discarded
+            self._mq_executor.shutdown(wait=False, cancel_futures=True)
+            self._mq_executor = None
+
         # 注意：不关闭 Redis 客户端，因为它是全局单例
         logger.info("⚠️ Redis connection kept open (shared instance)")
 
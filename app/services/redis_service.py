@@ -6,21 +6,57 @@ from app.core.config import Config
 class RedisClient:
     """Singleton Redis client."""
     _instance = None
+    _pubsub_instance = None
 
     @classmethod
     def get_instance(cls):
-        """Get or create Redis client instance."""
+        """
+        Get or create Redis client instance.
+
+        The client is backed by a bounded, blocking connection pool so that
+        concurrent commands run on separate connections and callers wait for
+        a free connection instead of opening unbounded new ones. Idle pooled
+        connections use TCP keepalive, and replies are parsed by hiredis
+        (installed through the redis[hiredis] extra, picked up automatically).
+        """
         if cls._instance is None:
-            cls._instance = redis.Redis(
-                host=Config.redis.HOST,
-                port=Config.redis.PORT,
-                decode_responses=True
-            )
+            cls._instance = cls._create_client(Config.redis.MAX_CONNECTIONS)
         return cls._instance
 
+    @classmethod
+    def get_pubsub_instance(cls):
+        """
+        Get or create the Redis client used for pub/sub subscriptions.
+
+        A subscription holds its connection for as long as it is open, so
+        subscribers get a pool of their own: open status streams can then
+        never starve the command pool used by get_instance().
+        """
+        if cls._pubsub_instance is None:
+            cls._pubsub_instance = cls._create_client(Config.redis.PUBSUB_MAX_CONNECTIONS)
+        return cls._pubsub_instance
+
+    @staticmethod
+    def _create_client(max_connections: int):
+        """Create a client backed by its own bounded connection pool."""
+        pool = redis.BlockingConnectionPool(
+            host=Config.redis.HOST,
+            port=Config.redis.PORT,
+            max_connections=max_connections,
+            timeout=Config.redis.POOL_TIMEOUT,
+            health_check_interval=Config.redis.HEALTH_CHECK_INTERVAL,
+            socket_keepalive=True,
+            decode_responses=True
+        )
+        # from_pool() hands pool ownership to the client, so aclose() disconnects it
+        return redis.Redis.from_pool(pool)
+
     @classmethod
     async def close_instance(cls):
-        """Close the Redis client instance."""
+        """Close the Redis client instances."""
         if cls._instance:
             await cls._instance.aclose()
             cls._instance = None
+        if cls._pubsub_instance:
+            await cls._pubsub_instance.aclose()
+            cls._pubsub_instance = None
@@ -1,4 +1,11 @@
 """RocketMQ service for message queue operations."""
+import asyncio
+import functools
+import queue
+import threading
+from concurrent.futures import Executor
+from typing import Optional
+
 from rocketmq import Producer, SimpleConsumer, Message, ClientConfiguration, Credentials, FilterExpression
 from app.core.config import Config
 
@@ -54,28 +61,6 @@ class RocketMQService:
         self.consumer.startup()
         return self.consumer
     
-    async def send_message(self, topic: str, body: bytes, tag: str = "") -> None:
-        """
-        Send a message to specified topic.
-
-        Args:
-            topic: Target topic
-            body: Message body (bytes)
-            tag: Message tag
-        """
-        if not self.producer:
-            raise RuntimeError("Producer not initialized. Call create_producer() first.")
-
-        msg = Message()
-        msg.topic = topic
-        msg.body = body
-        msg.tag = tag
-
-        # Use executor for the blocking send operation
-        import asyncio
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.producer.send, msg)
-    
     def shutdown_producer(self) -> None:
         """Shutdown the producer."""
         if self.producer:
@@ -92,3 +77,246 @@ class RocketMQService:
         """Shutdown both producer and consumer."""
         self.shutdown_producer()
         self.shutdown_consumer()
+
+
+class RocketMQBatcher:
+    """
+    Coalesce outgoing messages into batches for a single producer.
+
+    Callers enqueue messages and await the returned future; a background task
+    drains the queue in batches of up to ``max_messages`` (waiting at most
+    ``max_seconds`` for a batch to fill) and submits them in one executor
+    call. Only the executor hop is amortized over the batch: each message is
+    still its own ``producer.send_async`` RPC, but none waits for the broker
+    before the next is submitted.
+    """
+
+    def __init__(
+        self,
+        producer: Producer,
+        max_messages: int = Config.mq.BATCH_MAX_MESSAGES,
+        max_seconds: float = Config.mq.BATCH_MAX_SECONDS,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize RocketMQBatcher.
+
+        Args:
+            producer: Started producer used to send the batches
+            max_messages: Maximum number of messages per batch
+            max_seconds: Maximum time to wait for a batch to fill
+            executor: Executor for the blocking submit (default: loop default)
+        """
+        self.producer = producer
+        self.max_messages = max_messages
+        self.max_seconds = max_seconds
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Future] = set()
+
+    def start(self) -> None:
+        """Start the background batching task."""
+        if self._worker_task:
+            return
+        self._queue = asyncio.Queue()
+        self._worker_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush pending messages and stop the background task."""
+        if not self._worker_task:
+            return
+        await self._queue.join()
+        self._worker_task.cancel()
+        try:
+            await self._worker_task
+        except asyncio.CancelledError:
+            pass
+        self._worker_task = None
+
+        # Wait for the broker to confirm what has already been submitted
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def enqueue(self, topic: str, body: bytes, tag: str = "") -> asyncio.Future:
+        """
+        Queue a message for the next batch.
+
+        Args:
+            topic: Target topic
+            body: Message body (bytes)
+            tag: Message tag
+
+        Returns:
+            Future resolved with the send receipt once the batch is confirmed
+        """
+        if not self._worker_task:
+            raise RuntimeError("Batcher not started. Call start() first.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((topic, body, tag, future))
+        return future
+
+    async def _run(self) -> None:
+        """Collect queued messages into batches and send them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_seconds
+            while len(batch) < self.max_messages:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._send_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_batch(self, batch: list) -> None:
+        """Submit one batch and chain each send confirm to its caller's future."""
+        loop = asyncio.get_running_loop()
+        try:
+            outcomes = await loop.run_in_executor(self.executor, self._submit, batch)
+        except Exception as e:
+            outcomes = [e] * len(batch)
+
+        for (_, _, _, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                if not future.done():
+                    future.set_exception(outcome)
+                continue
+            confirm = asyncio.wrap_future(outcome)
+            self._inflight.add(confirm)
+            confirm.add_done_callback(self._inflight.discard)
+            confirm.add_done_callback(functools.partial(self._resolve, future))
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, confirm: asyncio.Future) -> None:
+        """Propagate a send confirm to the future returned by enqueue()."""
+        if future.done():
+            return
+        if confirm.cancelled():
+            future.cancel()
+        elif confirm.exception() is not None:
+            future.set_exception(confirm.exception())
+        else:
+            future.set_result(confirm.result())
+
+    def _submit(self, batch: list) -> list:
+        """Submit every message of a batch without waiting for confirms (blocking)."""
+        outcomes = []
+        for topic, body, tag, _ in batch:
+            msg = Message()
+            msg.topic = topic
+            msg.body = body
+            if tag:
+                msg.tag = tag
+            try:
+                outcomes.append(self.producer.send_async(msg))
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+
+class MQSubmitThread:
+    """
+    Submit producer sends and consumer acks from one persistent thread.
+
+    Operations are handed to the thread through a ``queue.SimpleQueue``
+    instead of waking an executor thread per call. The thread only submits
+    them with ``send_async``/``ack_async`` and never waits for the broker, so
+    a single thread keeps up with many concurrent callers; the broker
+    confirm is awaited on the event loop.
+    """
+
+    def __init__(self, producer: Optional[Producer] = None, consumer: Optional[SimpleConsumer] = None):
+        """
+        Initialize MQSubmitThread.
+
+        Args:
+            producer: Started producer used by send()
+            consumer: Started consumer used by ack()
+        """
+        self.producer = producer
+        self.consumer = consumer
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the submit thread."""
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name="mq-submit", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Submit every queued operation, then stop the thread (blocking)."""
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    async def send(self, msg: Message):
+        """
+        Send a message with the producer.
+
+        Args:
+            msg: Message to send
+
+        Returns:
+            Send receipt once the broker has confirmed the message
+        """
+        return await self._submit(self.producer.send_async, msg)
+
+    async def ack(self, msg) -> None:
+        """
+        Acknowledge a received message with the consumer.
+
+        Args:
+            msg: Message to acknowledge
+        """
+        await self._submit(self.consumer.ack_async, msg)
+
+    async def _submit(self, op, msg):
+        """Queue an operation for the thread and await its broker confirm."""
+        if not self._thread:
+            raise RuntimeError("Submit thread not started. Call start() first.")
+
+        loop = asyncio.get_running_loop()
+        submitted = loop.create_future()
+        self._queue.put((op, msg, loop, submitted))
+        return await asyncio.wrap_future(await submitted)
+
+    def _run(self) -> None:
+        """Submit queued operations until stop() (runs on the submit thread)."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            op, msg, loop, submitted = item
+            try:
+                outcome = op(msg)
+            except Exception as e:
+                outcome = e
+            try:
+                loop.call_soon_threadsafe(self._resolve, submitted, outcome)
+            except RuntimeError:
+                # The caller's loop is already closed
+                pass
+
+    @staticmethod
+    def _resolve(submitted: asyncio.Future, outcome) -> None:
+        """Hand the submit outcome to the awaiting caller (runs on its loop)."""
+        if submitted.done():
+            return
+        if isinstance(outcome, Exception):
+            submitted.set_exception(outcome)
+        else:
+            submitted.set_result(outcome)
@@ -0,0 +1,188 @@
+"""单元测试共用的假 RocketMQ / Redis 客户端 (无需 RocketMQ 与 Redis)"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class FakeMQClient:
+    """
+    Fake producer/consumer recording send_async and ack_async calls.
+
+    Confirms are resolved immediately, or left to the test when auto_confirm
+    is off. A submit raises for every message in fail_messages, matched on
+    the message body (or the message itself when it has none).
+    """
+
+    def __init__(self, auto_confirm: bool = True):
+        self.auto_confirm = auto_confirm
+        self.sent = []
+        self.acked = []
+        self.confirms = []
+        self.threads = set()
+        self.fail_messages = set()
+
+    @staticmethod
+    def _key(msg):
+        return getattr(msg, "body", msg)
+
+    def _submit(self, target: list, msg, result) -> Future:
+        self.threads.add(threading.current_thread().name)
+        if self._key(msg) in self.fail_messages:
+            raise RuntimeError("submit failed")
+        confirm = Future()
+        target.append(msg)
+        self.confirms.append(confirm)
+        if self.auto_confirm:
+            confirm.set_result(result)
+        return confirm
+
+    def send_async(self, msg) -> Future:
+        key = self._key(msg)
+        if isinstance(key, bytes):
+            key = key.decode()
+        return self._submit(self.sent, msg, f"receipt-{key}")
+
+    def ack_async(self, msg) -> Future:
+        return self._submit(self.acked, msg, None)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FakeMessage:
+    """Received message carrying only a body."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+class FakeConsumer(FakeMQClient):
+    """
+    Fake SimpleConsumer serving queued messages.
+
+    receive() long-polls like the real consumer: it blocks until messages
+    are queued, await_duration passes or the consumer is shut down; polling
+    is set while it blocks. Receive and ack times are recorded per message
+    body.
+    """
+
+    def __init__(self, await_duration: float = 30):
+        super().__init__()
+        self.await_duration = await_duration
+        self.receives = []
+        self.received_at = {}
+        self.acked_at = {}
+        self._messages = deque()
+        self._closed = False
+        self._cond = threading.Condition()
+        self.polling = threading.Event()
+
+    def put(self, *bodies: bytes) -> None:
+        with self._cond:
+            self._messages.extend(FakeMessage(body) for body in bodies)
+            self._cond.notify_all()
+
+    def receive(self, max_message_num: int, invisible_duration: int) -> list:
+        with self._cond:
+            self.polling.set()
+            self._cond.wait_for(lambda: self._messages or self._closed, timeout=self.await_duration)
+            self.polling.clear()
+            self.receives.append(max_message_num)
+            count = min(max_message_num, len(self._messages))
+            received = [self._messages.popleft() for _ in range(count)]
+        now = time.monotonic()
+        for msg in received:
+            self.received_at[msg.body] = now
+        return received
+
+    def ack_async(self, msg) -> Future:
+        self.acked_at[msg.body] = time.monotonic()
+        return super().ack_async(msg)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FakeMQService:
+    """Stands in for RocketMQService, handing out the given fake clients."""
+
+    def __init__(self, consumer: FakeConsumer, producer: FakeMQClient):
+        self.consumer = consumer
+        self.producer = producer
+
+    def create_consumer(self, consumer_group: str, topic: str, tag: str = "*") -> FakeConsumer:
+        return self.consumer
+
+    def create_producer(self) -> FakeMQClient:
+        return self.producer
+
+    def shutdown_all(self) -> None:
+        self.producer.shutdown()
+        self.consumer.shutdown()
+
+
+class FakeRedis:
+    """
+    Fake async Redis client: GET/SET/DELETE and the worker's status pipeline.
+
+    The next failures[command] calls of a command raise ConnectionError.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+        self.failures = {}
+
+    def _check(self, command: str) -> None:
+        if self.failures.get(command):
+            self.failures[command] -= 1
+            raise ConnectionError(f"redis {command} failed")
+
+    async def get(self, key: str):
+        self._check("get")
+        return self.values.get(key)
+
+    async def set(self, key: str, value, ex=None, nx: bool = False):
+        self._check("set")
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self._check("delete")
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffers SET/PUBLISH commands until execute()."""
+
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._commands.clear()
+
+    def set(self, key: str, value, ex=None, nx: bool = False) -> None:
+        self._commands.append(("set", key, value))
+
+    def publish(self, channel: str, message) -> None:
+        self._commands.append(("publish", channel, message))
+
+    async def execute(self) -> list:
+        for command, key, value in self._commands:
+            if command == "set":
+                self._redis.values[key] = value
+            else:
+                self._redis.published.append((key, value))
+        return [True] * len(self._commands)
@@ -3,6 +3,12 @@ import asyncio
 import json
 import time
 import httpx
+
+try:
+    import uvloop
+except ImportError:  # Not installed on Windows
+    uvloop = None
+
 from rocketmq import SimpleConsumer, ClientConfiguration, Credentials, FilterExpression
 
 # 配置
@@ -28,44 +34,48 @@ async def test_full_flow():
     }
     print(f"请求数据: {json.dumps(request_data, ensure_ascii=False, indent=2)}")
     
-    async with httpx.AsyncClient() as client:
+    # 整个流程共用一个客户端，复用连接池
+    async with httpx.AsyncClient(timeout=10.0) as client:
         response = await client.post(
             f"{API_BASE_URL}/tasks",
-            json=request_data,
-            timeout=10.0
+            json=request_data
         )
         result = response.json()
         task_id = result["task_id"]
-        
-    print(f"✅ 任务已创建")
-    print(f"响应: {json.dumps(result, ensure_ascii=False, indent=2)}")
-    print(f"Task ID: {task_id}")
-    
-    # ========== 2. 查询任务状态 ==========
-    print(f"\n🔍 步骤 2: 查询任务状态")
-    
-    async with httpx.AsyncClient() as client:
+
+        print(f"✅ 任务已创建")
+        print(f"响应: {json.dumps(result, ensure_ascii=False, indent=2)}")
+        print(f"Task ID: {task_id}")
+
+        # ========== 2. 查询任务状态 ==========
+        print(f"\n🔍 步骤 2: 查询任务状态")
+
         # 立即查询一次
         response = await client.get(f"{API_BASE_URL}/tasks/{task_id}")
         status_result = response.json()
         print(f"初始状态: {json.dumps(status_result, ensure_ascii=False, indent=2)}")
-        
-        # 轮询直到完成
-        max_retries = 10
-        for i in range(max_retries):
-            await asyncio.sleep(1)
+
+        # 指数退避轮询直到完成 (100ms 起步，最长间隔 2s，总计最多约 10s)
+        max_wait = 10
+        delay = 0.1
+        deadline = time.monotonic() + max_wait
+        attempt = 0
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+            attempt += 1
             response = await client.get(f"{API_BASE_URL}/tasks/{task_id}")
             status_result = response.json()
             status = status_result["status"]
-            print(f"[{i+1}/{max_retries}] 当前状态: {status}")
-            
+            print(f"[{attempt}] 当前状态: {status}")
+
             if status == "done":
                 print("✅ 任务已完成")
                 break
         else:
             print("⚠️ 任务未在预期时间内完成")
             return
-    
+
     # ========== 3. 从 MQ 获取结果 ==========
     print(f"\n📥 步骤 3: 从 MQ 获取处理结果")
     print(f"订阅 Topic: {MQ_TOPIC_RESULT}")
@@ -140,4 +150,4 @@ async def test_full_flow():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_full_flow())
+    asyncio.run(test_full_flow(), loop_factory=uvloop.new_event_loop if uvloop else None)
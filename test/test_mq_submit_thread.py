@@ -0,0 +1,78 @@
+"""MQSubmitThread 单元测试 (使用假 Producer/Consumer, 无需 RocketMQ)"""
+import asyncio
+import threading
+import unittest
+
+from app.services.rocketmq_service import MQSubmitThread
+from test.fakes import FakeMQClient
+
+
+class MQSubmitThreadTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client = FakeMQClient()
+        self.submit = MQSubmitThread(producer=self.client, consumer=self.client)
+        self.submit.start()
+
+    async def asyncTearDown(self):
+        self.submit.stop()
+
+    async def test_send_and_ack_succeed(self):
+        receipts = await asyncio.wait_for(
+            asyncio.gather(*(self.submit.send(f"m{i}") for i in range(5))), timeout=5
+        )
+        await asyncio.wait_for(self.submit.ack("r0"), timeout=5)
+
+        self.assertEqual(receipts, [f"receipt-m{i}" for i in range(5)])
+        self.assertEqual(self.client.acked, ["r0"])
+        self.assertEqual(self.client.threads, {"mq-submit"})
+
+    async def test_submit_error_is_raised_to_caller(self):
+        self.client.fail_messages.add("bad")
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(self.submit.send("bad"), timeout=5)
+
+        # The thread keeps serving later operations
+        self.assertEqual(await asyncio.wait_for(self.submit.send("m"), timeout=5), "receipt-m")
+
+    async def test_failed_confirm_is_raised_to_caller(self):
+        self.client.auto_confirm = False
+        ack = asyncio.ensure_future(self.submit.ack("r"))
+        while not self.client.confirms:
+            await asyncio.sleep(0.01)
+        self.client.confirms[0].set_exception(ConnectionError("ack rejected"))
+
+        with self.assertRaises(ConnectionError):
+            await asyncio.wait_for(ack, timeout=5)
+
+    async def test_stop_submits_queued_operations(self):
+        # Hold the thread inside the first submit so the rest stay queued
+        gate = threading.Event()
+        send_async = self.client.send_async
+
+        def blocking_send(msg):
+            gate.wait()
+            return send_async(msg)
+
+        self.client.send_async = blocking_send
+        sends = [asyncio.ensure_future(self.submit.send(f"m{i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+
+        stopping = asyncio.ensure_future(asyncio.to_thread(self.submit.stop))
+        await asyncio.sleep(0.05)
+        self.assertFalse(stopping.done())
+        gate.set()
+        await asyncio.wait_for(stopping, timeout=5)
+
+        self.assertEqual(self.client.sent, ["m0", "m1", "m2"])
+        receipts = await asyncio.wait_for(asyncio.gather(*sends), timeout=5)
+        self.assertEqual(receipts, ["receipt-m0", "receipt-m1", "receipt-m2"])
+
+    async def test_submit_requires_start(self):
+        submit = MQSubmitThread(producer=self.client)
+        with self.assertRaises(RuntimeError):
+            await submit.send("m")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""ProxyAgent 消费循环单元测试 (使用假 Consumer/Producer/Redis, 无需 RocketMQ 与 Redis)"""
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import orjson
+
+from app.services.proxy_agent import ProxyAgent
+from test.fakes import FakeConsumer, FakeMQClient, FakeMQService, FakeRedis
+
+
+def task_body(task_id: str) -> bytes:
+    return orjson.dumps({"task_id": task_id, "user_id": "u", "payload": "c"})
+
+
+class ProxyAgentTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs a started ProxyAgent whose agents sleep for task_seconds."""
+
+    max_concurrent_tasks = 2
+    task_seconds = 0.0
+
+    async def asyncSetUp(self):
+        self.consumer = FakeConsumer()
+        self.producer = FakeMQClient()
+        self.redis = FakeRedis()
+        self.executed = []
+        self.running = 0
+        self.max_running = 0
+
+        self.agent = ProxyAgent(max_concurrent_tasks=self.max_concurrent_tasks)
+        self.agent.mq_service = FakeMQService(self.consumer, self.producer)
+        self.agent._execute_task = self._execute_task
+        with mock.patch("app.services.proxy_agent.RedisClient.get_instance", return_value=self.redis):
+            await self.agent.startup()
+
+    async def asyncTearDown(self):
+        try:
+            await self.shutdown()
+        finally:
+            # Never leave a receive thread long-polling, even if shutdown hung
+            self.consumer.shutdown()
+
+    async def shutdown(self):
+        await asyncio.wait_for(self.agent.shutdown(), timeout=5)
+
+    async def _execute_task(self, task_data: dict) -> dict:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.task_seconds)
+        finally:
+            self.running -= 1
+        self.executed.append(task_data["task_id"])
+        return {"success": True, "data": {}}
+
+    def status(self, task_id: str):
+        return self.redis.values.get(f"task:{task_id}:status")
+
+    async def wait_until(self, predicate, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "condition not reached in time")
+            await asyncio.sleep(0.01)
+
+    async def wait_done(self, *task_ids: str):
+        await self.wait_until(lambda: all(self.status(t) == "D" for t in task_ids))
+
+
+class PrefetchTest(ProxyAgentTestCase):
+
+    task_seconds = 0.3
+
+    async def test_received_messages_do_not_wait_for_a_busy_slot(self):
+        task_ids = [f"t{i}" for i in range(6)]
+        self.consumer.put(*map(task_body, task_ids))
+        await self.wait_done(*task_ids)
+
+        # Every message is acked right after its receive, never after a
+        # running task frees a slot
+        waits = [self.consumer.acked_at[b] - self.consumer.received_at[b] for b in map(task_body, task_ids)]
+        self.assertLess(max(waits), self.task_seconds / 2)
+        self.assertTrue(all(n <= self.max_concurrent_tasks for n in self.consumer.receives))
+
+
+
+class ConsumerLoopTest(ProxyAgentTestCase):
+
+    task_seconds = 0.1
+
+    async def test_slots_are_returned_after_malformed_messages_and_ack_failures(self):
+        self.consumer.fail_messages.add(task_body("unacked"))
+        self.consumer.put(b"not json", b'{"user_id": "u"}', b"[1]", b"x" * (1024 * 1024 + 1), task_body("unacked"))
+        await self.wait_until(lambda: len(self.consumer.acked) == 4)
+
+        # Both slots are free again: two more tasks run side by side
+        self.consumer.put(task_body("a"), task_body("b"))
+        await self.wait_done("a", "b")
+        self.assertEqual(self.max_running, 2)
+
+        await self.shutdown()
+        self.assertEqual(self.agent.semaphore._value, self.max_concurrent_tasks)
+
+    async def test_unacked_messages_are_never_dispatched(self):
+        self.consumer.fail_messages.add(task_body("unacked"))
+        self.consumer.put(task_body("unacked"), task_body("acked"))
+        await self.wait_done("acked")
+        await self.shutdown()
+
+        self.assertEqual(self.executed, ["acked"])
+        self.assertIsNone(self.status("unacked"))
+
+    async def test_shutdown_interrupts_pending_receive(self):
+        # Let the loop block in a receive that would long-poll for 30s
+        await self.wait_until(self.consumer.polling.is_set)
+
+        started = time.monotonic()
+        await self.shutdown()
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertTrue(self.agent._consumer_task.done())
+        self.assertEqual(self.executed, [])
+
+
+class ConcurrencyLimitTest(ProxyAgentTestCase):
+
+    max_concurrent_tasks = 3
+    task_seconds = 0.05
+
+    async def test_concurrency_never_exceeds_the_limit(self):
+        task_ids = [f"t{i}" for i in range(20)]
+        for task_id in task_ids:
+            self.consumer.put(task_body(task_id))
+            await asyncio.sleep(0.005)
+        await self.wait_done(*task_ids)
+
+        self.assertEqual(self.max_running, self.max_concurrent_tasks)
+        self.assertEqual(sorted(self.executed), sorted(task_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""RocketMQBatcher 单元测试 (使用假 Producer, 无需 RocketMQ)"""
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from app.services.rocketmq_service import RocketMQBatcher
+from test.fakes import FakeMQClient
+
+
+class RocketMQBatcherTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.producer = FakeMQClient()
+
+    async def asyncTearDown(self):
+        self.executor.shutdown(wait=True)
+
+    def _batcher(self, max_messages: int, max_seconds: float) -> RocketMQBatcher:
+        batcher = RocketMQBatcher(
+            self.producer, max_messages=max_messages, max_seconds=max_seconds, executor=self.executor
+        )
+        batcher.start()
+        return batcher
+
+    async def test_full_batch_is_sent_without_waiting_for_deadline(self):
+        batcher = self._batcher(max_messages=3, max_seconds=60)
+        with mock.patch.object(batcher, "_submit", wraps=batcher._submit) as submit:
+            futures = [await batcher.enqueue("Topic", str(i).encode(), "Tag") for i in range(3)]
+            receipts = await asyncio.wait_for(asyncio.gather(*futures), timeout=5)
+        await batcher.stop()
+
+        self.assertEqual(receipts, ["receipt-0", "receipt-1", "receipt-2"])
+        self.assertEqual([len(call.args[0]) for call in submit.call_args_list], [3])
+        self.assertEqual([msg.tag for msg in self.producer.sent], ["Tag"] * 3)
+
+    async def test_partial_batch_is_sent_at_deadline(self):
+        batcher = self._batcher(max_messages=10, max_seconds=0.05)
+        with mock.patch.object(batcher, "_submit", wraps=batcher._submit) as submit:
+            futures = [await batcher.enqueue("Topic", str(i).encode()) for i in range(2)]
+            await asyncio.wait_for(asyncio.gather(*futures), timeout=5)
+            futures.append(await batcher.enqueue("Topic", b"2"))
+            await asyncio.wait_for(futures[-1], timeout=5)
+        await batcher.stop()
+
+        self.assertEqual([len(call.args[0]) for call in submit.call_args_list], [2, 1])
+
+    async def test_submit_failure_fails_only_that_message(self):
+        self.producer.fail_messages.add(b"bad")
+        batcher = self._batcher(max_messages=3, max_seconds=60)
+        futures = [await batcher.enqueue("Topic", body) for body in (b"a", b"bad", b"c")]
+        results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), timeout=5)
+        await batcher.stop()
+
+        self.assertEqual(results[0], "receipt-a")
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2], "receipt-c")
+
+    async def test_executor_failure_fails_whole_batch(self):
+        batcher = self._batcher(max_messages=2, max_seconds=60)
+        with mock.patch.object(batcher, "_submit", side_effect=RuntimeError("executor down")):
+            futures = [await batcher.enqueue("Topic", body) for body in (b"a", b"b")]
+            results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), timeout=5)
+        await batcher.stop()
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    async def test_confirm_failure_propagates_to_caller(self):
+        self.producer.auto_confirm = False
+        batcher = self._batcher(max_messages=1, max_seconds=60)
+        future = await batcher.enqueue("Topic", b"a")
+        while not self.producer.confirms:
+            await asyncio.sleep(0.01)
+        self.producer.confirms[0].set_exception(ConnectionError("broker rejected"))
+
+        with self.assertRaises(ConnectionError):
+            await asyncio.wait_for(future, timeout=5)
+        await batcher.stop()
+
+    async def test_stop_waits_for_inflight_confirms(self):
+        self.producer.auto_confirm = False
+        batcher = self._batcher(max_messages=1, max_seconds=60)
+        future = await batcher.enqueue("Topic", b"a")
+        while not self.producer.confirms:
+            await asyncio.sleep(0.01)
+
+        # The broker confirms from its own thread only after stop() has begun
+        timer = threading.Timer(0.1, self.producer.confirms[0].set_result, args=("receipt-a",))
+        timer.start()
+        await asyncio.wait_for(batcher.stop(), timeout=5)
+        timer.join()
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), "receipt-a")
+
+    async def test_enqueue_requires_start(self):
+        batcher = RocketMQBatcher(self.producer, executor=self.executor)
+        with self.assertRaises(RuntimeError):
+            await batcher.enqueue("Topic", b"a")
+
+
+if __name__ == "__main__":
+    unittest.main()
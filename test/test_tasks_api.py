@@ -0,0 +1,90 @@
+"""任务 API 单元测试 (使用假 Redis 与假 Producer, 无需 RocketMQ 与 Redis)"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import orjson
+from fastapi import HTTPException
+
+import app.api.tasks_api as tasks_api
+from app.models.task import MAX_MESSAGE_BYTES, TaskRequest
+from app.services.rocketmq_service import RocketMQBatcher
+from test.fakes import FakeMQClient, FakeRedis
+
+
+class CreateTaskTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.redis = FakeRedis()
+        self.producer = FakeMQClient()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batcher = RocketMQBatcher(self.producer, max_seconds=0, executor=self.executor)
+        self.batcher.start()
+        patcher = mock.patch.multiple(tasks_api, redis_client=self.redis, mq_batcher=self.batcher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.batcher.stop()
+        self.executor.shutdown(wait=True)
+
+    def sent_task_ids(self) -> list:
+        return [orjson.loads(msg.body)["task_id"] for msg in self.producer.sent]
+
+    async def create(self) -> dict:
+        return await tasks_api.create_task(TaskRequest(user_id="u", content="c"))
+
+    async def test_queued_task_is_sent_and_status_written(self):
+        response = await self.create()
+
+        self.assertEqual(response["status"], "queued")
+        self.assertEqual(self.sent_task_ids(), [response["task_id"]])
+        self.assertEqual(self.redis.values, {f"task:{response['task_id']}:status": "Q"})
+
+    async def test_status_write_failure_after_send_retries_and_still_queues(self):
+        self.redis.failures["set"] = 1
+        response = await self.create()
+
+        self.assertEqual(response["status"], "queued")
+        self.assertEqual(self.sent_task_ids(), [response["task_id"]])
+        self.assertEqual(self.redis.values, {f"task:{response['task_id']}:status": "Q"})
+
+    async def test_status_write_failing_twice_after_send_still_queues(self):
+        self.redis.failures["set"] = 2
+        response = await self.create()
+
+        # The task is on MQ and will run: no 500, and nothing to roll back
+        self.assertEqual(response["status"], "queued")
+        self.assertEqual(self.sent_task_ids(), [response["task_id"]])
+        self.assertEqual(self.redis.values, {})
+
+    async def test_send_failure_rolls_back_status(self):
+        with mock.patch.object(self.producer, "send_async", side_effect=RuntimeError("broker down")):
+            with self.assertRaises(HTTPException) as ctx:
+                await self.create()
+
+        self.assertEqual(ctx.exception.status_code, 500)
+        self.assertEqual(self.redis.values, {})
+
+    async def test_send_and_status_write_failure_returns_500(self):
+        self.redis.failures["set"] = 1
+        with mock.patch.object(self.producer, "send_async", side_effect=RuntimeError("broker down")):
+            with self.assertRaises(HTTPException) as ctx:
+                await self.create()
+
+        self.assertEqual(ctx.exception.status_code, 500)
+        self.assertEqual(self.producer.sent, [])
+
+
+    async def test_oversized_task_is_rejected_before_anything_is_written(self):
+        content = "x" * MAX_MESSAGE_BYTES
+        with self.assertRaises(HTTPException) as ctx:
+            await tasks_api.create_task(TaskRequest(user_id="u", content=content))
+
+        self.assertEqual(ctx.exception.status_code, 413)
+        self.assertEqual(self.producer.sent, [])
+        self.assertEqual(self.redis.values, {})
+
+
+if __name__ == "__main__":
+    unittest.main()